@@ -7,11 +7,13 @@ individually. Use the ``--auto`` flag to stream them without pausing.
 
 from __future__ import annotations
 
-import argparse
-from typing import Iterable, List
+import codecs
+import os
+import sys
+from typing import Iterable, Sequence, TextIO, Tuple
 
 
-PROMPTS: List[str] = [
+PROMPTS: Tuple[str, ...] = (
     "Find inference■scaling benchmarks, summarize results, cite sources.",
     "Retrieve KV■cache compression papers and compare reported speedups.",
     "Search 2023–2025 LLM security vulnerabilities with source links.",
@@ -61,21 +63,74 @@ PROMPTS: List[str] = [
     "Retrieve examples of AI■film scriptwriting, produce new scene.",
     "Find multimodal■AI use■cases and list examples.",
     "Retrieve research on rhythm + emotion, write poem modelled.",
-]
+)
 
 
-def iter_prompts(prompts: Iterable[str], auto: bool) -> None:
-    """Print each prompt to stdout, optionally pausing between them."""
+def _format_prompts(prompts: Sequence[str]) -> Tuple[str, ...]:
+    """Render each prompt with its numbered header and separator."""
 
+    blocks = []
     for index, prompt in enumerate(prompts, start=1):
-        header = f"Prompt {index}/{len(PROMPTS)}"
-        separator = "-" * len(header)
-        print(f"\n{header}\n{separator}\n{prompt}\n")
-        if not auto and index != len(PROMPTS):
+        header = f"Prompt {index}/{len(prompts)}"
+        blocks.append(f"\n{header}\n{'-' * len(header)}\n{prompt}\n\n")
+    return tuple(blocks)
+
+
+_FORMATTED: Tuple[str, ...] = _format_prompts(PROMPTS)
+_FORMATTED_TEXT = "".join(_FORMATTED)
+# Pre-encoded for UTF-8 terminals, the only non-ASCII case the raw path accepts.
+_FORMATTED_UTF8 = _FORMATTED_TEXT.encode("utf-8")
+
+
+def _can_write_raw(stream: TextIO, payload: str) -> bool:
+    """Whether ``payload`` can bypass ``stream`` and go straight to its file descriptor."""
+
+    if os.name == "nt" or not stream.isatty():
+        return False
+    return payload.isascii() or codecs.lookup(stream.encoding or "ascii").name == "utf-8"
+
+
+def _iter_auto(blocks: Tuple[str, ...]) -> None:
+    """Emit every prompt at once, straight to the terminal when possible."""
+
+    precomputed = blocks is _FORMATTED
+    text = _FORMATTED_TEXT if precomputed else "".join(blocks)
+    sys.stdout.flush()
+    if not _can_write_raw(sys.stdout, text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        return
+    encoding = codecs.lookup(sys.stdout.encoding or "ascii").name
+    if precomputed and encoding == "utf-8":
+        data = memoryview(_FORMATTED_UTF8)
+    else:
+        data = memoryview(text.encode(encoding, sys.stdout.errors or "strict"))
+    fd = sys.stdout.fileno()
+    while data:
+        data = data[os.write(fd, data):]
+
+
+def _iter_interactive(blocks: Tuple[str, ...]) -> None:
+    last = len(blocks) - 1
+    for index, block in enumerate(blocks):
+        sys.stdout.write(block)
+        if index != last:
             input("Press Enter to continue to the next prompt...")
 
 
+def iter_prompts(prompts: Iterable[str], auto: bool) -> None:
+    """Print each prompt to stdout, optionally pausing between them."""
+
+    blocks = _FORMATTED if prompts is PROMPTS else _format_prompts(tuple(prompts))
+    if auto:
+        _iter_auto(blocks)
+    else:
+        _iter_interactive(blocks)
+
+
 def main() -> None:
+    import argparse
+
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument(
         "--auto",
@@ -7,56 +7,128 @@ the same REPL without sharing screens or terminals.
 """
 from __future__ import annotations
 
-import argparse
-import datetime as _dt
+import ast
+import codecs
+import itertools
+import os
 import pathlib
-import textwrap
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+import sys
+import time
+from collections import OrderedDict, deque
+from types import CodeType
+from typing import Callable, Deque, Dict, List, Optional, TextIO, Tuple
+
+_COMPILE_CACHE_SIZE = 256
+_HISTORY_LIMIT = 10_000
+_HISTORY_TAIL = 25
+_ANONYMOUS = "anonymous"
+
+_HELP_TEXT = """\
+Commands (prefix with /):
+  /join <name>      Add a player and set as active if first
+  /switch <name>    Change the active player
+  /leave <name>     Remove a player
+  /players          Show joined players and turn counts
+  /history          Show session history
+  /load <path>      Execute a Python script file in the shared context
+  /reset            Clear history and context (keeps players)
+  /save <path>      Write history to a file
+  /help             Show this help message
+  /quit             Exit the game
+
+Everything else is treated as Python and executed in the shared context."""
+
+def _read_source(path: pathlib.Path) -> str:
+    return path.read_bytes().decode("utf-8")
+
+
+def _can_write_raw(stream: TextIO, payload: str) -> bool:
+    """Whether ``payload`` can bypass ``stream`` and go straight to its file descriptor."""
+
+    if os.name == "nt" or not stream.isatty():
+        return False
+    return payload.isascii() or codecs.lookup(stream.encoding or "ascii").name == "utf-8"
+
+
+def _write_raw(payload: str) -> None:
+    if not _can_write_raw(sys.stdout, payload):
+        sys.stdout.write(payload)
+        return
+    sys.stdout.flush()
+    encoding = codecs.lookup(sys.stdout.encoding or "ascii").name
+    data = memoryview(payload.encode(encoding, sys.stdout.errors or "strict"))
+    fd = sys.stdout.fileno()
+    while data:
+        data = data[os.write(fd, data):]
 
 
-@dataclass
 class HistoryEntry:
     """Record of an executed command."""
 
-    player: str
-    code: str
-    timestamp: _dt.datetime = field(default_factory=_dt.datetime.now)
+    __slots__ = ("player", "code", "timestamp")
+
+    def __init__(self, player: str, code: str, timestamp: Optional[int] = None) -> None:
+        self.player = player
+        self.code = code
+        self.timestamp = int(time.time()) if timestamp is None else timestamp
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__qualname__}(player={self.player!r}, "
+            f"code={self.code!r}, timestamp={self.timestamp!r})"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.player, self.code, self.timestamp) == (other.player, other.code, other.timestamp)
 
     def __str__(self) -> str:  # pragma: no cover - small helper
-        ts = self.timestamp.strftime("%H:%M:%S")
+        ts = time.strftime("%H:%M:%S", time.localtime(self.timestamp))
         return f"[{ts}] {self.player}: {self.code}"
 
 
 class CampfireRepl:
     """Simple collaborative REPL for a shared Python environment."""
 
-    def __init__(self, session_name: str, start_script: Optional[pathlib.Path] = None) -> None:
+    def __init__(
+        self,
+        session_name: str,
+        start_script: Optional[pathlib.Path] = None,
+        history_limit: int = _HISTORY_LIMIT,
+    ) -> None:
         self.session_name = session_name
         self.players: List[str] = []
         self.active_player: Optional[str] = None
-        self.history: List[HistoryEntry] = []
-        self.stats: Dict[str, int] = {}
-        self.context: Dict[str, object] = {
+        self._prompt_str = "[no-player] >>> "
+        self.history: Deque[HistoryEntry] = deque(maxlen=history_limit)
+        self.stats: Dict[str, int] = {_ANONYMOUS: 0}
+        self._compile_cache: OrderedDict[str, Tuple[CodeType, bool]] = OrderedDict()
+        self.context: Dict[str, object] = self._fresh_context()
+        if start_script:
+            self._bootstrap_with_script(start_script)
+
+    def _fresh_context(self) -> Dict[str, object]:
+        return {
             "__builtins__": __builtins__,
-            "session_name": session_name,
+            "session_name": self.session_name,
             "joined": self.players,
             "history": self.history,
         }
-        if start_script:
-            self._bootstrap_with_script(start_script)
 
     def _bootstrap_with_script(self, script_path: pathlib.Path) -> None:
-        if not script_path.exists():
-            raise FileNotFoundError(f"Bootstrap script '{script_path}' was not found")
-        self._execute_block(script_path.read_text(encoding="utf-8"), label=str(script_path))
+        try:
+            code = _read_source(script_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Bootstrap script '{script_path}' was not found") from None
+        self._execute_block(code, label=str(script_path))
 
     def add_player(self, name: str) -> None:
         if name not in self.players:
             self.players.append(name)
             self.stats.setdefault(name, 0)
             if self.active_player is None:
-                self.active_player = name
+                self._set_active(name)
 
     def remove_player(self, name: str) -> None:
         if name not in self.players:
@@ -64,52 +136,51 @@ class CampfireRepl:
         self.players.remove(name)
         self.stats.pop(name, None)
         if self.active_player == name:
-            self.active_player = self.players[0] if self.players else None
+            self._set_active(self.players[0] if self.players else None)
 
     def set_active_player(self, name: str) -> None:
         if name in self.players:
-            self.active_player = name
+            self._set_active(name)
+
+    def _set_active(self, name: Optional[str]) -> None:
+        self.active_player = name
+        self._prompt_str = f"[{name or 'no-player'}] >>> "
 
     def _record_command(self, code: str) -> None:
-        player = self.active_player or "anonymous"
+        player = self.active_player or _ANONYMOUS
         self.history.append(HistoryEntry(player=player, code=code))
-        self.stats[player] = self.stats.get(player, 0) + 1
+        try:
+            self.stats[player] += 1
+        except KeyError:
+            self.stats[player] = 1
 
     def _execute_block(self, code: str, label: str = "snippet") -> None:
         compiled = compile(code, label, "exec")
         exec(compiled, self.context, None)
 
+    def _compile_snippet(self, code: str) -> Tuple[CodeType, bool]:
+        entry = self._compile_cache.get(code)
+        if entry is not None:
+            self._compile_cache.move_to_end(code)
+            return entry
+        tree = ast.parse(code, "<input>", "exec")
+        if len(tree.body) == 1 and isinstance(tree.body[0], ast.Expr):
+            entry = (compile(ast.Expression(tree.body[0].value), "<input>", "eval"), True)
+        else:
+            entry = (compile(tree, "<input>", "exec"), False)
+        self._compile_cache[code] = entry
+        if len(self._compile_cache) > _COMPILE_CACHE_SIZE:
+            self._compile_cache.popitem(last=False)
+        return entry
+
     def _execute_snippet(self, code: str) -> None:
-        try:
-            compiled = compile(code, "<input>", "eval")
-            is_eval = True
-        except SyntaxError:
-            compiled = compile(code, "<input>", "exec")
-            is_eval = False
+        compiled, is_eval = self._compile_snippet(code)
         result = eval(compiled, self.context, None) if is_eval else exec(compiled, self.context, None)
         if result is not None:
             print(result)
 
     def _print_help(self) -> None:
-        print(
-            textwrap.dedent(
-                """
-                Commands (prefix with /):
-                  /join <name>      Add a player and set as active if first
-                  /switch <name>    Change the active player
-                  /leave <name>     Remove a player
-                  /players          Show joined players and turn counts
-                  /history          Show session history
-                  /load <path>      Execute a Python script file in the shared context
-                  /reset            Clear history and context (keeps players)
-                  /save <path>      Write history to a file
-                  /help             Show this help message
-                  /quit             Exit the game
-
-                Everything else is treated as Python and executed in the shared context.
-                """
-            ).strip()
-        )
+        print(_HELP_TEXT)
 
     def _print_players(self) -> None:
         if not self.players:
@@ -118,65 +189,64 @@ class CampfireRepl:
         rows = [f"* {name} ({self.stats.get(name, 0)} turns){' <- active' if name == self.active_player else ''}" for name in self.players]
         print("\n".join(rows))
 
+    def _history_tail(self) -> List[HistoryEntry]:
+        # Walk from the right end: islice from the left is O(len(history)) on a deque.
+        return list(itertools.islice(reversed(self.history), _HISTORY_TAIL))[::-1]
+
     def _print_history(self) -> None:
         if not self.history:
             print("History is empty.")
             return
-        for entry in self.history[-25:]:
-            print(entry)
+        _write_raw("\n".join(map(str, self._history_tail())) + "\n")
 
     def _reset_context(self) -> None:
-        active_players = list(self.players)
-        active_stats = dict(self.stats)
-        self.__init__(self.session_name)
-        self.players = active_players
-        self.stats = active_stats
-        if self.players and self.active_player is None:
-            self.active_player = self.players[0]
+        self.history.clear()
+        self.context = self._fresh_context()
         print("Context and history cleared; players kept.")
 
     def _save_history(self, destination: pathlib.Path) -> None:
         destination.parent.mkdir(parents=True, exist_ok=True)
-        destination.write_text("\n".join(str(entry) for entry in self.history), encoding="utf-8")
+        with destination.open("w", encoding="utf-8", buffering=1 << 16) as handle:
+            handle.writelines(f"{entry}\n" for entry in self.history)
         print(f"History saved to {destination}")
 
+    def _load_script(self, target: str) -> None:
+        path = pathlib.Path(target).expanduser()
+        self._execute_block(_read_source(path), label=str(path))
+
+    def _save_to(self, target: str) -> None:
+        self._save_history(pathlib.Path(target).expanduser())
+
+    # Maps each command to its handler and whether it requires an argument.
+    _HANDLERS: Dict[str, Tuple[Callable[..., None], bool]] = {
+        "/join": (add_player, True),
+        "/switch": (set_active_player, True),
+        "/leave": (remove_player, True),
+        "/players": (_print_players, False),
+        "/history": (_print_history, False),
+        "/load": (_load_script, True),
+        "/reset": (_reset_context, False),
+        "/save": (_save_to, True),
+        "/help": (_print_help, False),
+    }
+
     def _dispatch_command(self, command: str) -> bool:
-        parts = command.split()
-        cmd = parts[0].lower()
-        arg = parts[1:] if len(parts) > 1 else []
+        cmd, *rest = command.split(None, 1)
+        # Commands are almost always typed in lowercase; only fold case on a miss.
+        entry = self._HANDLERS.get(cmd) or self._HANDLERS.get(cmd.lower())
+        if entry is None and cmd.lower() == "/quit":
+            return False
 
-        if cmd == "/join" and arg:
-            self.add_player(" ".join(arg))
-            return True
-        if cmd == "/switch" and arg:
-            self.set_active_player(" ".join(arg))
-            return True
-        if cmd == "/leave" and arg:
-            self.remove_player(" ".join(arg))
-            return True
-        if cmd == "/players":
-            self._print_players()
-            return True
-        if cmd == "/history":
-            self._print_history()
+        arg = " ".join(rest[0].split()) if rest else ""
+        if entry is None or (entry[1] and not arg):
+            print("Unknown command. Type /help for options.")
             return True
-        if cmd == "/load" and arg:
-            target = pathlib.Path(" ".join(arg)).expanduser()
-            self._execute_block(target.read_text(encoding="utf-8"), label=str(target))
-            return True
-        if cmd == "/reset":
-            self._reset_context()
-            return True
-        if cmd == "/save" and arg:
-            target = pathlib.Path(" ".join(arg)).expanduser()
-            self._save_history(target)
-            return True
-        if cmd == "/help":
-            self._print_help()
-            return True
-        if cmd == "/quit":
-            return False
-        print("Unknown command. Type /help for options.")
+
+        handler, takes_arg = entry
+        if takes_arg:
+            handler(self, arg)
+        else:
+            handler(self)
         return True
 
     def run(self) -> None:
@@ -184,9 +254,8 @@ class CampfireRepl:
         print("Type /help for commands. Everyone shares the same context—take turns!")
 
         while True:
-            label = self.active_player or "no-player"
             try:
-                line = input(f"[{label}] >>> ").strip()
+                line = input(self._prompt_str).strip()
             except (EOFError, KeyboardInterrupt):
                 print("\nExiting. See you next time!")
                 break
@@ -208,6 +277,8 @@ class CampfireRepl:
 
 
 def main() -> None:
+    import argparse
+
     parser = argparse.ArgumentParser(description="Collaborative REPL for local Python script rounds.")
     parser.add_argument(
         "--session",